@@ -1,8 +1,15 @@
 import os
 from functools import lru_cache
-from dotenv import load_dotenv
-# 👇 Load environment variables from the .env file
-load_dotenv()
+from pathlib import Path
+
+# 👇 Load environment variables from the project's .env file. Pointing at the
+# file directly skips find_dotenv's stack inspection and directory walk, and
+# ENV_FILE="" turns it off where the environment is already populated.
+_env_file = os.getenv("ENV_FILE", str(Path(__file__).resolve().parent.parent / ".env"))
+if _env_file and os.path.exists(_env_file):
+    from dotenv import load_dotenv
+
+    load_dotenv(_env_file)
 
 
 class Settings:
@@ -24,10 +31,36 @@ class Settings:
     # Multi-tenancy
     TENANT_HEADER: str = os.getenv("TENANT_HEADER", "X-Tenant-ID")
 
+    # Admission control
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "32"))
+    ADMISSION_TENANT_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_TENANT_MAX_CONCURRENCY", "8"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "2"))
+
+    # Response compression and caching
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    CATALOG_CACHE_MAX_AGE: int = int(os.getenv("CATALOG_CACHE_MAX_AGE", "60"))
+
+    # Course media
+    MEDIA_STORAGE: str = os.getenv("MEDIA_STORAGE", "local")  # local, s3
+    MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", "media")
+    MEDIA_CHUNK_SIZE: int = int(os.getenv("MEDIA_CHUNK_SIZE", str(8 * 1024 * 1024)))
+    MEDIA_MAX_SIZE: int = int(os.getenv("MEDIA_MAX_SIZE", str(10 * 1024 * 1024 * 1024)))
+    MEDIA_S3_BUCKET: str = os.getenv("MEDIA_S3_BUCKET", "")
+    MEDIA_S3_ENDPOINT_URL: str = os.getenv("MEDIA_S3_ENDPOINT_URL", "")
+    MEDIA_S3_REGION: str = os.getenv("MEDIA_S3_REGION", "")
+
     # Stripe
     STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY", "")
     STRIPE_WEBHOOK_SECRET: str = os.getenv("STRIPE_WEBHOOK_SECRET", "")
 
+    # Event streaming (empty REDIS_URL keeps fan-out in-process)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    SSE_KEEPALIVE_SECONDS: float = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+    SSE_MAX_STREAM_SECONDS: float = float(os.getenv("SSE_MAX_STREAM_SECONDS", "300"))
+
 
 @lru_cache()
 def get_settings() -> "Settings":
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi import Depends, Header, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from sqlalchemy import select
@@ -47,4 +47,8 @@ def require_roles(*allowed_roles: str):
     return checker
 
 
-
+async def public_catalog_cache(response: Response) -> None:
+    # Anonymous catalog responses differ only by tenant, so shared caches
+    # (CDNs) may store them as long as they key on the tenant header
+    response.headers["Cache-Control"] = f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}"
+    response.headers["Vary"] = settings.TENANT_HEADER
@@ -1,10 +1,18 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
-from .routers import auth_router, orgs_router, courses_router, payments_router
+from .routers import auth_router, orgs_router, courses_router, media_router, payments_router
 from .database import engine, Base
-from .middleware import TenantMiddleware
+from .dependencies import require_roles
+from .middleware import (
+    AdmissionControlMiddleware,
+    AdmissionMetrics,
+    CompressionMiddleware,
+    TenantMiddleware,
+    skip_admission,
+)
+from .services import get_payment_events
 
 
 def create_app() -> FastAPI:
@@ -13,6 +21,13 @@ def create_app() -> FastAPI:
    
     app.add_middleware(TenantMiddleware)
 
+    app.add_middleware(CompressionMiddleware)
+
+    # Admission control runs before the remaining middleware and the app so it
+    # sheds load early, but inside CORS so 503s still carry CORS headers
+    app.state.admission_metrics = AdmissionMetrics()
+    app.add_middleware(AdmissionControlMiddleware, metrics=app.state.admission_metrics)
+
     # Add CORS middleware 
     origins = [
         "http://localhost:3000",    # Flutter web (if running on localhost)
@@ -32,19 +47,30 @@ def create_app() -> FastAPI:
 
     # Health check route
     @app.get("/health")
+    @skip_admission
     def health_check():
         return {"status": "ok", "env": settings.ENVIRONMENT}
 
+    @app.get("/metrics/admission", dependencies=[Depends(require_roles("admin"))])
+    @skip_admission
+    def admission_metrics():
+        return app.state.admission_metrics.snapshot()
+
     # Database startup event (create tables)
     @app.on_event("startup")
     async def on_startup():
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
+    @app.on_event("shutdown")
+    async def on_shutdown():
+        await get_payment_events().close()
+
     # Include all routers
     app.include_router(auth_router)
     app.include_router(orgs_router)
     app.include_router(courses_router)
+    app.include_router(media_router)
     app.include_router(payments_router)
 
     return app
@@ -1,5 +1,6 @@
+from .admission import AdmissionControlMiddleware, AdmissionMetrics, skip_admission
+from .compression import CompressionMiddleware
 from .tenant import TenantMiddleware
 
-__all__ = ["TenantMiddleware"]
-
+__all__ = ["AdmissionControlMiddleware", "AdmissionMetrics", "CompressionMiddleware", "TenantMiddleware", "skip_admission"]
 
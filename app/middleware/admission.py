@@ -0,0 +1,199 @@
+import asyncio
+import re
+import time
+from collections import Counter
+from typing import Callable, Iterable, TypeVar
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..config import settings
+
+
+Endpoint = TypeVar("Endpoint", bound=Callable)
+
+
+def skip_admission(endpoint: Endpoint) -> Endpoint:
+    """Let requests routed to ``endpoint`` bypass admission control.
+
+    For operational routes and long-lived streams, which must neither queue
+    behind ordinary traffic nor pin a slot. Apply below the route decorator;
+    the exemption covers only the methods that route serves.
+    """
+    endpoint.skip_admission = True
+    return endpoint
+
+
+class AdmissionMetrics:
+    # Bounds the per-tenant breakdown; tenants beyond it are counted as "other"
+    MAX_TRACKED_TENANTS = 1000
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.bypassed = 0
+        self.in_flight = 0
+        self.queued = 0
+        self.shed: Counter[str] = Counter()
+        self.shed_by_tenant: Counter[str] = Counter()
+        self.queue_wait_seconds = 0.0
+
+    def record_shed(self, reason: str, tenant_id: str) -> None:
+        self.shed[reason] += 1
+        key = tenant_id or "-"
+        if key not in self.shed_by_tenant and len(self.shed_by_tenant) >= self.MAX_TRACKED_TENANTS:
+            key = "other"
+        self.shed_by_tenant[key] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "admitted": self.admitted,
+            "bypassed": self.bypassed,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "shed_total": sum(self.shed.values()),
+            "shed": dict(self.shed),
+            "shed_by_tenant": dict(self.shed_by_tenant),
+            "queue_wait_seconds_total": round(self.queue_wait_seconds, 6),
+        }
+
+
+async def _acquire_within(semaphore: asyncio.Semaphore, timeout: float) -> bool:
+    if not semaphore.locked():
+        await semaphore.acquire()
+        return True
+    if timeout <= 0:
+        return False
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+class _TenantSlot:
+    def __init__(self, limit: int) -> None:
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI admission control with global and per-tenant concurrency limits.
+
+    Requests wait at most ``queue_timeout`` seconds for a slot and are rejected
+    with 503 once the wait budget is spent or ``max_queue`` requests are
+    already waiting. Requests routed to endpoints marked with
+    ``skip_admission``, and paths matching ``priority_paths``, skip admission
+    entirely.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_concurrency: int = settings.ADMISSION_MAX_CONCURRENCY,
+        tenant_max_concurrency: int = settings.ADMISSION_TENANT_MAX_CONCURRENCY,
+        max_queue: int = settings.ADMISSION_MAX_QUEUE,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        priority_paths: Iterable[str] = (),
+        metrics: AdmissionMetrics | None = None,
+    ) -> None:
+        self.app = app
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tenant_max_concurrency = tenant_max_concurrency
+        self.priority_paths = [re.compile(pattern) for pattern in priority_paths]
+        self.metrics = metrics or AdmissionMetrics()
+        self.tenant_header = settings.TENANT_HEADER.lower().encode("latin-1")
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._tenants: dict[str, _TenantSlot] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._is_priority(scope):
+            if scope["type"] == "http":
+                self.metrics.bypassed += 1
+            await self.app(scope, receive, send)
+            return
+
+        tenant_id = self._tenant_id(scope)
+        if self.metrics.queued >= self.max_queue:
+            self.metrics.record_shed("queue_full", tenant_id)
+            await self._reject(scope, receive, send)
+            return
+
+        slot = self._tenants.get(tenant_id)
+        if slot is None:
+            slot = self._tenants[tenant_id] = _TenantSlot(self.tenant_max_concurrency)
+        slot.users += 1
+        try:
+            if not await self._acquire(slot, tenant_id):
+                await self._reject(scope, receive, send)
+                return
+            self.metrics.admitted += 1
+            self.metrics.in_flight += 1
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.metrics.in_flight -= 1
+                self._global.release()
+                slot.semaphore.release()
+        finally:
+            slot.users -= 1
+            if slot.users == 0:
+                del self._tenants[tenant_id]
+
+    async def _acquire(self, slot: _TenantSlot, tenant_id: str) -> bool:
+        # Tenant slot first so a noisy tenant queues behind its own quota
+        # instead of crowding everyone else out of the global queue
+        started = time.monotonic()
+        self.metrics.queued += 1
+        try:
+            if not await _acquire_within(slot.semaphore, self.queue_timeout):
+                self.metrics.record_shed("tenant_timeout", tenant_id)
+                return False
+            remaining = self.queue_timeout - (time.monotonic() - started)
+            try:
+                acquired = await _acquire_within(self._global, remaining)
+            except BaseException:
+                # Cancelled while queued: hand the tenant permit back
+                slot.semaphore.release()
+                raise
+            if not acquired:
+                slot.semaphore.release()
+                self.metrics.record_shed("global_timeout", tenant_id)
+                return False
+            return True
+        finally:
+            self.metrics.queued -= 1
+            self.metrics.queue_wait_seconds += time.monotonic() - started
+
+    def _is_priority(self, scope: Scope) -> bool:
+        if scope["method"] == "OPTIONS":
+            return True
+        path = scope["path"]
+        if any(pattern.match(path) for pattern in self.priority_paths):
+            return True
+        # Routing has not happened yet; resolve the endpoint the router will
+        # pick so the exemption can live on the route itself
+        router = getattr(scope.get("app"), "router", None)
+        for route in getattr(router, "routes", ()):
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(child_scope.get("endpoint"), "skip_admission", False)
+        return False
+
+    def _tenant_id(self, scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == self.tenant_header:
+                tenant_id = value.decode("latin-1").strip()
+                # Tenant ids are integers; anything else shares one bucket so
+                # junk headers cannot mint fresh quotas or metric keys
+                return tenant_id if tenant_id.isdigit() else "invalid"
+        return ""
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": "Server overloaded, retry later"},
+            status_code=503,
+            headers={"Retry-After": str(max(1, round(self.queue_timeout)))},
+        )
+        await response(scope, receive, send)
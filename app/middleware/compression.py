@@ -0,0 +1,191 @@
+import re
+import zlib
+from typing import Iterable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip is offered without it
+    brotli = None
+
+
+DEFAULT_EXCLUDED_PATHS = (
+    # Stripe signs the raw bytes; keep the webhook exchange untouched
+    r"^/payments/webhook$",
+)
+DEFAULT_EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+
+
+def _accepted_encodings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _no_transform(cache_control: str) -> bool:
+    return any(directive.strip().lower() == "no-transform" for directive in cache_control.split(","))
+
+
+class _Encoder:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.flush()
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Pure ASGI gzip/brotli response compression.
+
+    Brotli is preferred when the ``brotli`` package is installed and the client
+    accepts it. Responses smaller than ``minimum_size`` are sent as-is; larger
+    ones are compressed chunk by chunk, so streamed output is never buffered
+    beyond the threshold. Paths matching ``excluded_paths``, responses of
+    ``excluded_media_types`` and responses a route marks as not to be altered
+    (``Cache-Control: no-transform``, or a ``Content-Range`` whose offsets
+    refer to the uncompressed bytes) pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+        excluded_paths: Iterable[str] = DEFAULT_EXCLUDED_PATHS,
+        excluded_media_types: Iterable[str] = DEFAULT_EXCLUDED_MEDIA_TYPES,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_paths = [re.compile(pattern) for pattern in excluded_paths]
+        self.excluded_media_types = tuple(excluded_media_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or any(pattern.match(scope["path"]) for pattern in self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        encoder: _Encoder | None = None
+        passthrough = False
+        # Up to minimum_size bytes are held back so responses that arrive in
+        # several small chunks are still measured against the threshold
+        pending: list[bytes] = []
+        pending_size = 0
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough, pending_size
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Hold the headers until the body decides the encoding
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                if encoder is None and start_message is not None:
+                    # Body extensions (zerocopy, pathsend) cannot be compressed;
+                    # release the held headers and any buffered bytes first
+                    passthrough = True
+                    await send(start_message)
+                    if pending:
+                        await send({"type": "http.response.body", "body": b"".join(pending), "more_body": True})
+                        pending.clear()
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(scope=start_message)
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                if (
+                    "content-encoding" in headers
+                    or "content-range" in headers
+                    or media_type in self.excluded_media_types
+                    or _no_transform(headers.get("cache-control", ""))
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                pending.append(body)
+                pending_size += len(body)
+                if more_body and pending_size < self.minimum_size:
+                    return
+                body = b"".join(pending)
+                pending.clear()
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+
+            if more_body:
+                # Flush per chunk so streamed output reaches the client promptly
+                chunk = encoder.compress(body) + encoder.flush() if body else b""
+            else:
+                chunk = encoder.compress(body) + encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _choose_encoding(self, accept_encoding: str) -> str | None:
+        accepted = _accepted_encodings(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
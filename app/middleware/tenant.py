@@ -1,16 +1,18 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from ..config import settings
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        header_name = settings.TENANT_HEADER
-        tenant_id = request.headers.get(header_name)
-        request.state.tenant_id = tenant_id or ""
-        response: Response = await call_next(request)
-        return response
+class TenantMiddleware:
+    # Pure ASGI so streamed and zero-copy responses pass through untouched
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            tenant_id = Headers(scope=scope).get(settings.TENANT_HEADER)
+            # request.state is backed by scope["state"]
+            scope.setdefault("state", {})["tenant_id"] = tenant_id or ""
+        await self.app(scope, receive, send)
 
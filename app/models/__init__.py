@@ -1,10 +1,12 @@
 from .core import Organization, User, Course
+from .media import CourseMedia
 from .payments import Payment
 
 __all__ = [
     "Organization",
     "User",
     "Course",
+    "CourseMedia",
     "Payment",
 ]
 
@@ -18,8 +18,15 @@ class Organization(Base, TimestampMixin):
     name: Mapped[str] = mapped_column(String(200), nullable=False, unique=True)
     slug: Mapped[str] = mapped_column(String(200), nullable=False, unique=True, index=True)
 
-    users: Mapped[list["User"]] = relationship(back_populates="organization", cascade="all, delete-orphan")
-    courses: Mapped[list["Course"]] = relationship(back_populates="organization", cascade="all, delete-orphan")
+    # Relationships default to lazy="raise": async sessions cannot lazy load,
+    # so endpoints declare selectinload/joinedload for what they serialize.
+    # passive_deletes lets the database ON DELETE CASCADE handle children.
+    users: Mapped[list["User"]] = relationship(
+        back_populates="organization", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
+    courses: Mapped[list["Course"]] = relationship(
+        back_populates="organization", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
 
 
 class User(Base, TimestampMixin):
@@ -32,7 +39,7 @@ class User(Base, TimestampMixin):
     hashed_password: Mapped[str] = mapped_column(String(255))
 
     tenant_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), index=True)
-    organization: Mapped[Organization] = relationship(back_populates="users")
+    organization: Mapped[Organization] = relationship(back_populates="users", lazy="raise")
 
 
 class Course(Base, TimestampMixin):
@@ -48,7 +55,10 @@ class Course(Base, TimestampMixin):
     instructor_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     tenant_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), index=True)
 
-    organization: Mapped[Organization] = relationship(back_populates="courses")
-    instructor: Mapped[User | None] = relationship()
+    organization: Mapped[Organization] = relationship(back_populates="courses", lazy="raise")
+    instructor: Mapped[User | None] = relationship(lazy="raise")
+    media: Mapped[list["CourseMedia"]] = relationship(
+        back_populates="course", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
 
 
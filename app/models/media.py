@@ -0,0 +1,28 @@
+from sqlalchemy import JSON, BigInteger, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..database import Base
+from .core import Course, TimestampMixin
+
+
+class CourseMedia(Base, TimestampMixin):
+    __tablename__ = "course_media"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id", ondelete="CASCADE"), index=True)
+    tenant_id: Mapped[int] = mapped_column(ForeignKey("organizations.id", ondelete="CASCADE"), index=True)
+
+    filename: Mapped[str] = mapped_column(String(255))
+    content_type: Mapped[str] = mapped_column(String(100))
+    size_bytes: Mapped[int] = mapped_column(BigInteger)
+    chunk_size: Mapped[int] = mapped_column(Integer)
+    uploaded_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    status: Mapped[str] = mapped_column(String(50), default="uploading")  # uploading, ready, failed
+
+    storage_key: Mapped[str] = mapped_column(String(500), unique=True)
+    storage_upload_id: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # Storage token (S3 ETag or part file) of each recorded part, in order
+    part_tokens: Mapped[list[str]] = mapped_column(JSON, default=list)
+
+    course: Mapped[Course] = relationship(back_populates="media", lazy="raise")
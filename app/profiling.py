@@ -0,0 +1,102 @@
+"""Startup profiling helpers.
+
+    python -m app.profiling imports [--top 25] [--module app.main]
+    python -m app.profiling ttfb [--runs 5]
+
+``imports`` runs ``python -X importtime`` in a fresh interpreter and lists the
+slowest imports by cumulative time. ``ttfb`` launches uvicorn and measures the
+time from process launch to the first successful ``GET /health`` response,
+printing a JSON line that can be tracked over time. Startup still runs the
+app's startup events, so point ``DATABASE_URL`` at a reachable database.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def profile_imports(module: str = "app.main", top: int = 25) -> list[tuple[int, int, str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows[:top]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_ttfb(timeout: float = 30.0) -> float:
+    """Seconds from launching a uvicorn worker until ``/health`` answers 200."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise SystemExit(f"uvicorn exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise SystemExit(f"no response from {url} within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.profiling", description="Startup profiling")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    imports = commands.add_parser("imports", help="slowest imports by cumulative time")
+    imports.add_argument("--module", default="app.main")
+    imports.add_argument("--top", type=int, default=25)
+
+    ttfb = commands.add_parser("ttfb", help="time from process launch to first response")
+    ttfb.add_argument("--runs", type=int, default=5)
+    ttfb.add_argument("--timeout", type=float, default=30.0)
+
+    args = parser.parse_args(argv)
+    if args.command == "imports":
+        print(f"{'self ms':>9} {'cumul ms':>9}  module")
+        for self_us, cumulative_us, name in profile_imports(args.module, args.top):
+            print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+    else:
+        samples = [measure_ttfb(args.timeout) * 1000 for _ in range(args.runs)]
+        print(json.dumps({
+            "metric": "startup_ttfb_ms",
+            "runs": len(samples),
+            "min": round(min(samples), 1),
+            "median": round(statistics.median(samples), 1),
+            "max": round(max(samples), 1),
+        }))
+
+
+if __name__ == "__main__":
+    main()
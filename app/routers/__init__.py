@@ -1,12 +1,14 @@
 from .auth import router as auth_router
 from .organizations import router as orgs_router
 from .courses import router as courses_router
+from .media import router as media_router
 from .payments import router as payments_router
 
 __all__ = [
     "auth_router",
     "orgs_router",
     "courses_router",
+    "media_router",
     "payments_router",
 ]
 
@@ -2,7 +2,6 @@ from typing import Annotated
 import jwt
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,7 +10,7 @@ from fastapi import Depends
 
 from ..database import get_db_session
 from ..models import User
-from ..utils import create_access_token, create_refresh_token,verify_password
+from ..utils import create_access_token, create_refresh_token, hash_password, verify_password
 from ..dependencies import get_current_user
 from ..models import Organization
 
@@ -35,7 +34,6 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
 
 DbDep = Annotated[AsyncSession, Depends(get_db_session)]
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 @router.post("/register", response_model=TokenResponse)
 async def register(data: RegisterRequest, db: DbDep):
     # check existing email
@@ -53,7 +51,7 @@ async def register(data: RegisterRequest, db: DbDep):
         email=data.email,
         full_name=f"{data.firstName} {data.lastName}",
         role=data.role,
-        hashed_password=pwd_context.hash(data.password),
+        hashed_password=hash_password(data.password),
         tenant_id=data.tenant_id,
 )
     db.add(user)
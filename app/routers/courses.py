@@ -3,9 +3,10 @@ from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from ..database import get_db_session
-from ..dependencies import get_tenant_id, get_current_user, require_roles
+from ..dependencies import get_tenant_id, get_current_user, public_catalog_cache, require_roles
 from ..models import Course
 from ..schemas import CourseCreate, CourseRead
 
@@ -15,10 +16,16 @@ router = APIRouter(prefix="/courses", tags=["courses"])
 DbDep = Annotated[AsyncSession, Depends(get_db_session)]
 TenantDep = Annotated[str, Depends(get_tenant_id)]
 
+# Everything CourseRead serializes; both are many-to-one so joining keeps a
+# course listing to a single query whatever its length
+COURSE_READ_OPTIONS = (joinedload(Course.instructor), joinedload(Course.organization))
 
-@router.get("/", response_model=List[CourseRead])
+
+@router.get("/", response_model=List[CourseRead], dependencies=[Depends(public_catalog_cache)])
 async def list_courses(db: DbDep, tenant_id: TenantDep):
-    stmt = select(Course).where(Course.tenant_id == int(tenant_id)) if tenant_id else select(Course)
+    stmt = select(Course).options(*COURSE_READ_OPTIONS)
+    if tenant_id:
+        stmt = stmt.where(Course.tenant_id == int(tenant_id))
     result = await db.execute(stmt)
     return list(result.scalars())
 
@@ -44,7 +51,6 @@ async def create_course(
     )
     db.add(course)
     await db.commit()
-    await db.refresh(course)
-    return course
+    return await db.scalar(select(Course).options(*COURSE_READ_OPTIONS).where(Course.id == course.id))
 
 
@@ -0,0 +1,332 @@
+import hashlib
+import uuid
+from typing import Annotated, AsyncIterator, List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import get_db_session
+from ..dependencies import get_current_user, get_tenant_id, require_roles
+from ..middleware import skip_admission
+from ..models import Course, CourseMedia, Payment, User
+from ..schemas import MediaCreate, MediaRead
+from ..services.delivery import MediaResponse, RangeNotSatisfiable, parse_byte_range
+from ..services.storage import get_storage
+
+
+router = APIRouter(prefix="/courses/{course_id}/media", tags=["media"])
+
+DbDep = Annotated[AsyncSession, Depends(get_db_session)]
+TenantDep = Annotated[str, Depends(get_tenant_id)]
+UserDep = Annotated[User, Depends(get_current_user)]
+
+
+async def _get_course(db: AsyncSession, course_id: int, tenant_id: str, user: User) -> Course:
+    if not tenant_id or user.tenant_id != int(tenant_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cross-tenant access denied")
+    course = await db.scalar(select(Course).where(Course.id == course_id, Course.tenant_id == int(tenant_id)))
+    if not course:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+    return course
+
+
+async def _get_media(db: AsyncSession, course: Course, media_id: int) -> CourseMedia:
+    media = await db.scalar(
+        select(CourseMedia).where(CourseMedia.id == media_id, CourseMedia.course_id == course.id)
+    )
+    if not media:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media not found")
+    return media
+
+
+def _can_manage(course: Course, user: User) -> bool:
+    return user.role == "admin" or (user.role == "instructor" and course.instructor_id == user.id)
+
+
+def _require_manage(course: Course, user: User) -> None:
+    if not _can_manage(course, user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not the course instructor")
+
+
+async def _require_access(db: AsyncSession, course: Course, user: User) -> None:
+    # Free courses are open to the whole tenant; paid ones need a paid purchase
+    if _can_manage(course, user) or course.price_cents <= 0:
+        return
+    purchased = await db.scalar(
+        select(
+            exists().where(
+                Payment.course_id == course.id,
+                Payment.user_id == user.id,
+                Payment.tenant_id == course.tenant_id,
+                Payment.status == "paid",
+            )
+        )
+    )
+    if not purchased:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Course not purchased")
+
+
+def _parse_content_range(header: str | None) -> tuple[int, int, int]:
+    # Content-Range: bytes <start>-<end>/<total>
+    try:
+        unit, _, spec = header.partition(" ")
+        span, _, total = spec.partition("/")
+        first, _, last = span.partition("-")
+        start, end, size = int(first), int(last), int(total)
+    except (AttributeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Content-Range header")
+    if unit != "bytes" or end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Content-Range header")
+    return start, end, size
+
+
+async def _finish_upload(db: AsyncSession, media: CourseMedia) -> None:
+    # Assembling and hashing can take a while; release the connection first
+    await db.commit()
+    storage = get_storage()
+    try:
+        await storage.complete_upload(media.storage_key, media.storage_upload_id, media.part_tokens)
+        stored_size = await storage.size(media.storage_key)
+        checksum = await storage.checksum(media.storage_key)
+    except Exception:
+        # Storage trouble is not the client's fault: keep the recorded parts
+        # and the status so the completion can be retried
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Upload could not be assembled, retry completion",
+            headers={"Retry-After": "1"},
+        )
+    if stored_size != media.size_bytes:
+        media.status = "failed"
+        await db.commit()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Stored file size mismatch")
+    if media.sha256 and media.sha256 != checksum:
+        media.status = "failed"
+        await db.commit()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="File checksum mismatch")
+    media.sha256 = checksum
+    media.status = "ready"
+    media.storage_upload_id = None
+    media.part_tokens = []
+    await db.commit()
+
+
+@router.post(
+    "/",
+    response_model=MediaRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_roles("admin", "instructor"))],
+)
+async def create_media(course_id: int, data: MediaCreate, db: DbDep, tenant_id: TenantDep, user: UserDep):
+    """Start a resumable upload; send the bytes with ``PUT .../content``."""
+    course = await _get_course(db, course_id, tenant_id, user)
+    _require_manage(course, user)
+    if data.size_bytes > settings.MEDIA_MAX_SIZE:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+
+    storage = get_storage()
+    storage_key = f"tenants/{course.tenant_id}/courses/{course.id}/{uuid.uuid4().hex}"
+    media = CourseMedia(
+        course_id=course.id,
+        tenant_id=course.tenant_id,
+        filename=data.filename,
+        content_type=data.content_type,
+        size_bytes=data.size_bytes,
+        chunk_size=settings.MEDIA_CHUNK_SIZE,
+        uploaded_bytes=0,
+        part_tokens=[],
+        sha256=data.sha256,
+        status="uploading",
+        storage_key=storage_key,
+        storage_upload_id=await storage.begin_upload(storage_key),
+    )
+    db.add(media)
+    await db.commit()
+    await db.refresh(media)
+    return media
+
+
+@router.get("/", response_model=List[MediaRead])
+async def list_media(course_id: int, db: DbDep, tenant_id: TenantDep, user: UserDep):
+    course = await _get_course(db, course_id, tenant_id, user)
+    await _require_access(db, course, user)
+    result = await db.execute(
+        select(CourseMedia).where(CourseMedia.course_id == course.id).order_by(CourseMedia.id)
+    )
+    return list(result.scalars())
+
+
+@router.get("/{media_id}", response_model=MediaRead)
+async def get_media(course_id: int, media_id: int, db: DbDep, tenant_id: TenantDep, user: UserDep):
+    """Media metadata; ``uploaded_bytes`` is the offset to resume an upload from."""
+    course = await _get_course(db, course_id, tenant_id, user)
+    await _require_access(db, course, user)
+    return await _get_media(db, course, media_id)
+
+
+@router.put("/{media_id}/content", response_model=MediaRead)
+async def upload_media_chunk(
+    course_id: int,
+    media_id: int,
+    request: Request,
+    db: DbDep,
+    tenant_id: TenantDep,
+    user: UserDep,
+):
+    """Append one chunk, addressed with ``Content-Range: bytes start-end/total``.
+
+    Chunks must be sent in order and be exactly ``chunk_size`` bytes except
+    the last. An optional ``X-Chunk-SHA256`` header is checked against the
+    received bytes; the whole file is assembled and checked against
+    ``sha256`` once the last chunk lands. If that step answers 503, retry it
+    with ``POST .../complete``.
+    """
+    course = await _get_course(db, course_id, tenant_id, user)
+    _require_manage(course, user)
+    media = await _get_media(db, course, media_id)
+    if media.status != "uploading":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload already finished")
+    if media.uploaded_bytes == media.size_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="All chunks received; complete the upload",
+            headers={"Upload-Offset": str(media.uploaded_bytes)},
+        )
+
+    start, end, total = _parse_content_range(request.headers.get("Content-Range"))
+    expected_length = min(media.chunk_size, media.size_bytes - start)
+    if total != media.size_bytes or end - start + 1 != expected_length:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk does not match upload layout")
+    if start != media.uploaded_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Unexpected chunk offset",
+            headers={"Upload-Offset": str(media.uploaded_bytes)},
+        )
+    chunk_sha256 = request.headers.get("X-Chunk-SHA256")
+    part_number = start // media.chunk_size + 1
+    part_tokens = list(media.part_tokens)
+    storage_key, upload_id = media.storage_key, media.storage_upload_id
+
+    # Hand the connection back to the pool while the body streams in
+    await db.commit()
+
+    digest = hashlib.sha256()
+    received = 0
+
+    async def body() -> AsyncIterator[bytes]:
+        nonlocal received
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > expected_length:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk larger than declared")
+            digest.update(chunk)
+            yield chunk
+
+    storage = get_storage()
+    token = await storage.write_chunk(storage_key, upload_id, part_number, body())
+    error = None
+    if received != expected_length:
+        error = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk shorter than declared")
+    elif chunk_sha256 and chunk_sha256.lower() != digest.hexdigest():
+        error = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk checksum mismatch")
+    else:
+        # Compare-and-set on the offset: only one attempt at this chunk gets
+        # its part recorded, and the offset check also guards part_tokens
+        part_tokens.append(token)
+        advanced = await db.execute(
+            update(CourseMedia)
+            .where(CourseMedia.id == media.id, CourseMedia.uploaded_bytes == start)
+            .values(uploaded_bytes=end + 1, part_tokens=part_tokens)
+            .execution_options(synchronize_session=False)
+        )
+        if advanced.rowcount != 1:
+            await db.rollback()
+            error = HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Chunk already uploaded")
+    if error is not None:
+        await storage.discard_chunk(storage_key, upload_id, part_number, token)
+        raise error
+    await db.commit()
+    await db.refresh(media)
+
+    if media.uploaded_bytes == media.size_bytes:
+        await _finish_upload(db, media)
+    return media
+
+
+@router.post("/{media_id}/complete", response_model=MediaRead)
+async def complete_media_upload(course_id: int, media_id: int, db: DbDep, tenant_id: TenantDep, user: UserDep):
+    """Assemble an upload whose chunks have all been received.
+
+    The last ``PUT`` does this itself; call this to retry when that response
+    was a 503 or never arrived. Repeating it on a ready upload is harmless.
+    """
+    course = await _get_course(db, course_id, tenant_id, user)
+    _require_manage(course, user)
+    media = await _get_media(db, course, media_id)
+    if media.status == "ready":
+        return media
+    if media.status != "uploading":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload failed")
+    if media.uploaded_bytes != media.size_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is missing chunks",
+            headers={"Upload-Offset": str(media.uploaded_bytes)},
+        )
+    await _finish_upload(db, media)
+    return media
+
+
+@router.api_route("/{media_id}/content", methods=["GET", "HEAD"])
+# Downloads stream for as long as the client reads; only the authorization
+# queries at the start touch the database
+@skip_admission
+async def download_media(
+    course_id: int,
+    media_id: int,
+    request: Request,
+    db: DbDep,
+    tenant_id: TenantDep,
+    user: UserDep,
+):
+    """Serve the file, honouring a single ``Range`` for video seeking."""
+    course = await _get_course(db, course_id, tenant_id, user)
+    await _require_access(db, course, user)
+    media = await _get_media(db, course, media_id)
+    if media.status != "ready":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Media is not ready")
+
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range.strip('"') != media.sha256:
+        # The client's partial copy is stale; send the whole file instead
+        range_header = None
+    try:
+        byte_range = parse_byte_range(range_header, media.size_bytes)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{media.size_bytes}"},
+        )
+    return MediaResponse(
+        get_storage(),
+        media.storage_key,
+        media.size_bytes,
+        media.content_type,
+        media.filename,
+        etag=media.sha256,
+        byte_range=byte_range,
+    )
+
+
+@router.delete("/{media_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_media(course_id: int, media_id: int, db: DbDep, tenant_id: TenantDep, user: UserDep):
+    course = await _get_course(db, course_id, tenant_id, user)
+    _require_manage(course, user)
+    media = await _get_media(db, course, media_id)
+    await get_storage().delete(media.storage_key, media.storage_upload_id)
+    await db.delete(media)
+    await db.commit()
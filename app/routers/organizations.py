@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db_session
+from ..dependencies import public_catalog_cache
 from ..models import Organization
 from ..schemas import OrganizationCreate, OrganizationRead
 
@@ -26,7 +27,7 @@ async def create_org(data: OrganizationCreate, db: DbDep):
     return org
 
 
-@router.get("/{slug}", response_model=OrganizationRead)
+@router.get("/{slug}", response_model=OrganizationRead, dependencies=[Depends(public_catalog_cache)])
 async def get_org(slug: str, db: DbDep):
     org = await db.scalar(select(Organization).where(Organization.slug == slug))
     if not org:
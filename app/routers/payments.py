@@ -1,15 +1,18 @@
-from typing import Annotated
+import asyncio
+from typing import Annotated, AsyncIterator
 
-import stripe
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
-from ..database import get_db_session
+from ..database import SessionLocal, get_db_session
 from ..dependencies import get_current_user, get_tenant_id, require_roles
+from ..middleware import skip_admission
 from ..models import Course, Payment, User
-from ..schemas import PaymentCreate, PaymentRead
+from ..schemas import PaymentCreate, PaymentRead, PaymentStatusEvent
+from ..services import RESYNC, TERMINAL_PAYMENT_STATUSES, LocalPaymentEventBroker, get_payment_events
 
 
 router = APIRouter(prefix="/payments", tags=["payments"])
@@ -17,6 +20,15 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 DbDep = Annotated[AsyncSession, Depends(get_db_session)]
 
 
+def _stripe():
+    # The Stripe SDK is large; importing it on first use keeps it off the
+    # worker boot path
+    import stripe
+
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
+
+
 @router.post("/checkout", response_model=dict)
 async def create_checkout_session(
     payload: PaymentCreate,
@@ -37,7 +49,7 @@ async def create_checkout_session(
 
     if not settings.STRIPE_SECRET_KEY:
         raise HTTPException(status_code=500, detail="Stripe not configured")
-    stripe.api_key = settings.STRIPE_SECRET_KEY
+    stripe = _stripe()
 
     session = stripe.checkout.Session.create(
         mode="payment",
@@ -75,24 +87,36 @@ async def create_checkout_session(
     return {"checkout_url": session.url}
 
 
+# Checkout session events that settle a pending payment
+CHECKOUT_EVENT_STATUSES = {
+    "checkout.session.completed": "paid",
+    "checkout.session.expired": "failed",
+    "checkout.session.async_payment_failed": "failed",
+}
+
+
 @router.post("/webhook")
+@skip_admission
 async def stripe_webhook(request: Request, db: DbDep):
     payload = await request.body()
     sig_header = request.headers.get("Stripe-Signature")
     if not settings.STRIPE_WEBHOOK_SECRET:
         raise HTTPException(status_code=500, detail="Stripe webhook not configured")
     try:
-        event = stripe.Webhook.construct_event(payload, sig_header, settings.STRIPE_WEBHOOK_SECRET)
+        event = _stripe().Webhook.construct_event(payload, sig_header, settings.STRIPE_WEBHOOK_SECRET)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid payload")
 
-    if event["type"] == "checkout.session.completed":
+    new_status = CHECKOUT_EVENT_STATUSES.get(event["type"])
+    if new_status:
         session = event["data"]["object"]
         provider_payment_id = session["id"]
         payment = await db.scalar(select(Payment).where(Payment.provider_payment_id == provider_payment_id))
-        if payment:
-            payment.status = "paid"
+        # Never downgrade a payment that already settled
+        if payment and payment.status == "pending":
+            payment.status = new_status
             await db.commit()
+            await get_payment_events().publish(payment.id, payment.status)
     return {"received": True}
 
 
@@ -124,3 +148,84 @@ async def list_tenant_payments(
     return list(result.scalars())
 
 
+
+
+def _sse_status(payment_id: int, payment_status: str) -> str:
+    event = PaymentStatusEvent(id=payment_id, status=payment_status)
+    return f"event: status\ndata: {event.model_dump_json()}\n\n"
+
+
+async def _payment_status_stream(
+    events: LocalPaymentEventBroker,
+    queue: asyncio.Queue[str],
+    payment_id: int,
+    payment_status: str,
+) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    # Streams are bounded so a payment that never settles cannot pin a
+    # connection forever; clients reconnect and get the current status
+    deadline = loop.time() + settings.SSE_MAX_STREAM_SECONDS
+    try:
+        yield _sse_status(payment_id, payment_status)
+        while payment_status not in TERMINAL_PAYMENT_STATUSES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                received = await asyncio.wait_for(queue.get(), timeout=min(settings.SSE_KEEPALIVE_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if received == RESYNC:
+                async with SessionLocal() as session:
+                    received = await session.scalar(select(Payment.status).where(Payment.id == payment_id))
+                if received is None or received == payment_status:
+                    continue
+            payment_status = received
+            yield _sse_status(payment_id, payment_status)
+    finally:
+        events.unsubscribe(payment_id, queue)
+
+
+@router.get("/{payment_id}/events")
+# Event streams stay open for minutes; they must not pin an admission slot
+@skip_admission
+async def stream_payment_events(
+    payment_id: int,
+    db: DbDep,
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    user: Annotated[User, Depends(get_current_user)],
+):
+    """Server-Sent Events stream of status transitions for one of the caller's payments.
+
+    Sends the current status immediately and closes once the payment reaches a
+    terminal status, so clients no longer need to poll ``/payments/mine``.
+    Streams also close after ``SSE_MAX_STREAM_SECONDS``; clients reconnect.
+    """
+    if not tenant_id or user.tenant_id != int(tenant_id):
+        raise HTTPException(status_code=403, detail="Cross-tenant access denied")
+
+    # Subscribe before reading the current status so a webhook landing in
+    # between is not missed
+    events = get_payment_events()
+    queue = await events.subscribe(payment_id)
+    try:
+        payment = await db.scalar(
+            select(Payment).where(
+                Payment.id == payment_id,
+                Payment.tenant_id == int(tenant_id),
+                Payment.user_id == user.id,
+            )
+        )
+    except Exception:
+        events.unsubscribe(payment_id, queue)
+        raise
+    if not payment:
+        events.unsubscribe(payment_id, queue)
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    return StreamingResponse(
+        _payment_status_stream(events, queue, payment.id, payment.status),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
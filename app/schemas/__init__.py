@@ -1,15 +1,30 @@
-from .core import OrganizationCreate, OrganizationRead, UserCreate, UserRead, CourseCreate, CourseRead
-from .payments import PaymentCreate, PaymentRead
+from .core import (
+    OrganizationCreate,
+    OrganizationRead,
+    OrganizationSummary,
+    UserCreate,
+    UserRead,
+    InstructorSummary,
+    CourseCreate,
+    CourseRead,
+)
+from .media import MediaCreate, MediaRead
+from .payments import PaymentCreate, PaymentRead, PaymentStatusEvent
 
 __all__ = [
     "OrganizationCreate",
     "OrganizationRead",
+    "OrganizationSummary",
     "UserCreate",
     "UserRead",
+    "InstructorSummary",
     "CourseCreate",
     "CourseRead",
+    "MediaCreate",
+    "MediaRead",
     "PaymentCreate",
     "PaymentRead",
+    "PaymentStatusEvent",
 ]
 
 
@@ -36,6 +36,23 @@ class UserRead(UserBase):
         from_attributes = True
 
 
+class OrganizationSummary(BaseModel):
+    id: int
+    name: str
+    slug: str
+
+    class Config:
+        from_attributes = True
+
+
+class InstructorSummary(BaseModel):
+    id: int
+    full_name: str
+
+    class Config:
+        from_attributes = True
+
+
 class CourseBase(BaseModel):
     title: str
     description: str
@@ -51,6 +68,9 @@ class CourseRead(CourseBase):
     id: int
     tenant_id: int
     is_published: bool
+    instructor_id: int | None
+    instructor: InstructorSummary | None
+    organization: OrganizationSummary
 
     class Config:
         from_attributes = True
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field, field_validator
+
+from ..services.delivery import is_inline_media_type
+
+
+class MediaCreate(BaseModel):
+    filename: str = Field(max_length=255)
+    content_type: str = Field(max_length=100)
+    size_bytes: int = Field(gt=0)
+    sha256: str | None = Field(default=None, pattern="^[0-9a-f]{64}$")
+
+    @field_validator("content_type")
+    @classmethod
+    def check_content_type(cls, value: str) -> str:
+        value = value.strip().lower()
+        if not is_inline_media_type(value):
+            raise ValueError("content_type must be a video, audio, image (not SVG) or PDF type")
+        return value
+
+
+class MediaRead(BaseModel):
+    id: int
+    course_id: int
+    filename: str
+    content_type: str
+    size_bytes: int
+    chunk_size: int
+    uploaded_bytes: int
+    sha256: str | None
+    status: str
+
+    class Config:
+        from_attributes = True
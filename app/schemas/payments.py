@@ -20,3 +20,8 @@ class PaymentRead(BaseModel):
         from_attributes = True
 
 
+
+
+class PaymentStatusEvent(BaseModel):
+    id: int
+    status: str
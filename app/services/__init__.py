@@ -0,0 +1,15 @@
+from .events import (
+    RESYNC,
+    TERMINAL_PAYMENT_STATUSES,
+    LocalPaymentEventBroker,
+    RedisPaymentEventBroker,
+    get_payment_events,
+)
+
+__all__ = [
+    "RESYNC",
+    "TERMINAL_PAYMENT_STATUSES",
+    "LocalPaymentEventBroker",
+    "RedisPaymentEventBroker",
+    "get_payment_events",
+]
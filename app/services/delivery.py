@@ -0,0 +1,122 @@
+import re
+from urllib.parse import quote
+
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from .storage import StorageBackend
+
+
+# Course media a browser may render inline. Anything else, notably HTML and
+# SVG, could run script in the API's origin and is only served as a download.
+INLINE_MEDIA_TYPE_PREFIXES = ("video/", "audio/", "image/")
+INLINE_MEDIA_TYPES = frozenset({"application/pdf"})
+SCRIPTABLE_MEDIA_TYPES = frozenset({"image/svg+xml"})
+_MEDIA_TYPE = re.compile(r"^[a-z0-9][a-z0-9!#$&^_.+-]*/[a-z0-9][a-z0-9!#$&^_.+-]*$")
+
+
+def is_inline_media_type(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if not _MEDIA_TYPE.match(content_type) or content_type in SCRIPTABLE_MEDIA_TYPES:
+        return False
+    return content_type in INLINE_MEDIA_TYPES or content_type.startswith(INLINE_MEDIA_TYPE_PREFIXES)
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Resolve a ``Range`` header to an inclusive ``(start, end)`` pair.
+
+    Returns ``None`` when the whole entity should be sent: no header, a unit
+    other than bytes, or several ranges (answering those with the full body
+    is allowed and keeps responses single-part). Raises
+    ``RangeNotSatisfiable`` for ranges outside the entity.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        raise RangeNotSatisfiable()
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        raise RangeNotSatisfiable()
+    if start >= size or end < start:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+class MediaResponse(Response):
+    """ASGI response streaming a stored object, whole or as a single byte range.
+
+    When the server offers the ``http.response.zerocopy`` extension and the
+    object is on the local filesystem, the file descriptor is handed to the
+    server for ``sendfile``; otherwise the backend streams the range. Types
+    outside the inline allowlist are sent as ``application/octet-stream``
+    attachments.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        key: str,
+        size: int,
+        content_type: str,
+        filename: str,
+        etag: str | None = None,
+        byte_range: tuple[int, int] | None = None,
+    ) -> None:
+        self.storage = storage
+        self.key = key
+        self.background = None
+        self.start, self.end = byte_range if byte_range else (0, size - 1)
+        self.status_code = 206 if byte_range else 200
+        disposition = "inline"
+        if not is_inline_media_type(content_type):
+            content_type, disposition = "application/octet-stream", "attachment"
+        headers = {
+            "content-type": content_type,
+            "content-length": str(self.end - self.start + 1),
+            "accept-ranges": "bytes",
+            "content-disposition": f"{disposition}; filename*=UTF-8''{quote(filename)}",
+            "cache-control": "private, no-transform",
+            "x-content-type-options": "nosniff",
+        }
+        if etag:
+            headers["etag"] = f'"{etag}"'
+        if byte_range:
+            headers["content-range"] = f"bytes {self.start}-{self.end}/{size}"
+        self.raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.end < self.start:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        path = self.storage.local_path(self.key)
+        if path and "http.response.zerocopy" in scope.get("extensions", {}):
+            with open(path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": f,
+                    "offset": self.start,
+                    "count": self.end - self.start + 1,
+                })
+            return
+
+        async for chunk in self.storage.iter_range(self.key, self.start, self.end):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from functools import lru_cache
+
+from ..config import settings
+
+
+PAYMENT_EVENTS_CHANNEL = "coursehub:payment-events"
+TERMINAL_PAYMENT_STATUSES = frozenset({"paid", "failed", "refunded"})
+# Queued in place of a status when events may have been missed; subscribers
+# should re-read the payment from the database
+RESYNC = "__resync__"
+
+logger = logging.getLogger(__name__)
+
+
+class LocalPaymentEventBroker:
+    """In-process fan-out of payment status changes to waiting subscribers.
+
+    Used as-is in single-process mode; the Redis broker reuses the local
+    fan-out so each worker holds one Redis subscription regardless of how
+    many clients are listening.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[asyncio.Queue[str]]] = defaultdict(set)
+
+    async def subscribe(self, payment_id: int) -> asyncio.Queue[str]:
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=8)
+        self._subscribers[payment_id].add(queue)
+        return queue
+
+    def unsubscribe(self, payment_id: int, queue: asyncio.Queue[str]) -> None:
+        queues = self._subscribers.get(payment_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[payment_id]
+
+    async def publish(self, payment_id: int, status: str) -> None:
+        self._dispatch(payment_id, status)
+
+    async def close(self) -> None:
+        self._subscribers.clear()
+
+    def _dispatch(self, payment_id: int, status: str) -> None:
+        for queue in self._subscribers.get(payment_id, ()):
+            self._offer(queue, status)
+
+    def _resync_all(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._offer(queue, RESYNC)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue[str], status: str) -> None:
+        if queue.full():
+            # Only the latest status matters to a slow reader
+            queue.get_nowait()
+        queue.put_nowait(status)
+
+
+class RedisPaymentEventBroker(LocalPaymentEventBroker):
+    """Fans payment status changes out across workers via Redis pub/sub."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        from redis import asyncio as aioredis
+
+        # Health checks make a silently dead pub/sub connection fail (and
+        # reconnect) instead of blocking the listener indefinitely
+        self._redis = aioredis.Redis.from_url(url, health_check_interval=30)
+        self._listener: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        # Set once a listener has subscribed; every later (re)subscription,
+        # including one by a restarted listener task, may have missed events
+        self._subscribed_before = False
+
+    async def subscribe(self, payment_id: int) -> asyncio.Queue[str]:
+        if self._listener is None or self._listener.done():
+            self._ready.clear()
+            self._listener = asyncio.create_task(self._listen())
+        queue = await super().subscribe(payment_id)
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            # Redis unreachable: the caller still serves the current status
+            # and picks up events once the listener reconnects
+            pass
+        return queue
+
+    async def publish(self, payment_id: int, status: str) -> None:
+        from redis.exceptions import RedisError
+
+        message = json.dumps({"payment_id": payment_id, "status": status})
+        try:
+            await self._redis.publish(PAYMENT_EVENTS_CHANNEL, message)
+        except RedisError:
+            # The status change is already committed, so the webhook must not
+            # fail over the notification. Local streams still get it; streams
+            # on other workers see it when they reconnect at their time limit.
+            logger.exception("Failed to publish payment %s status %r", payment_id, status)
+            self._dispatch(payment_id, status)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._redis.aclose()
+        await super().close()
+
+    async def _listen(self) -> None:
+        from redis.exceptions import RedisError
+
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(PAYMENT_EVENTS_CHANNEL)
+                    self._ready.set()
+                    if self._subscribed_before:
+                        # Pub/sub does not replay messages published while
+                        # we were disconnected
+                        self._resync_all()
+                    self._subscribed_before = True
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._handle_message(message["data"])
+            except RedisError:
+                logger.warning("Payment events subscription lost; reconnecting", exc_info=True)
+            except Exception:
+                logger.exception("Payment events listener failed; restarting")
+            await asyncio.sleep(1)
+
+    def _handle_message(self, data: bytes | str) -> None:
+        try:
+            event = json.loads(data)
+            payment_id, status = int(event["payment_id"]), str(event["status"])
+        except (ValueError, TypeError, KeyError):
+            logger.warning("Ignoring malformed payment event: %r", data)
+            return
+        self._dispatch(payment_id, status)
+
+@lru_cache()
+def get_payment_events() -> LocalPaymentEventBroker:
+    if settings.REDIS_URL:
+        return RedisPaymentEventBroker(settings.REDIS_URL)
+    return LocalPaymentEventBroker()
@@ -0,0 +1,263 @@
+import hashlib
+from abc import ABC, abstractmethod
+import mmap
+import os
+import shutil
+import tempfile
+import uuid
+from functools import lru_cache
+from typing import AsyncIterator
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+
+
+READ_CHUNK_SIZE = 256 * 1024
+
+
+class StorageBackend(ABC):
+    """Where course media bytes live.
+
+    Uploads arrive as numbered parts. ``write_chunk`` stores one attempt at a
+    part and returns a token identifying it; the caller records the token of
+    the attempt that won and passes the tokens, in part order, to
+    ``complete_upload``. Retries and concurrent attempts at the same part
+    therefore never disturb a part already recorded. ``complete_upload`` may
+    be repeated for an upload it already completed. Reads are served as byte
+    ranges.
+    """
+
+    @abstractmethod
+    async def begin_upload(self, key: str) -> str | None:
+        """Prepare ``key`` for chunked writes, returning a backend upload id if any."""
+
+    @abstractmethod
+    async def write_chunk(
+        self, key: str, upload_id: str | None, part_number: int, chunks: AsyncIterator[bytes]
+    ) -> str:
+        ...
+
+    async def discard_chunk(self, key: str, upload_id: str | None, part_number: int, token: str) -> None:
+        """Drop a part attempt that was not recorded."""
+        return None
+
+    @abstractmethod
+    async def complete_upload(self, key: str, upload_id: str | None, parts: list[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str, upload_id: str | None = None) -> None:
+        ...
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Yield bytes ``start`` through ``end`` inclusive."""
+
+    def local_path(self, key: str) -> str | None:
+        """Filesystem path for zero-copy sends, when the backend has one."""
+        return None
+
+    async def checksum(self, key: str) -> str:
+        digest = hashlib.sha256()
+        async for chunk in self.iter_range(key, 0, await self.size(key) - 1):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    @abstractmethod
+    async def size(self, key: str) -> int:
+        ...
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+
+    def local_path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"storage key escapes media root: {key!r}")
+        return path
+
+    def _parts_dir(self, key: str) -> str:
+        return self.local_path(key) + ".parts"
+
+    async def begin_upload(self, key: str) -> None:
+        await run_in_threadpool(os.makedirs, self._parts_dir(key), exist_ok=True)
+        return None
+
+    async def write_chunk(
+        self, key: str, upload_id: str | None, part_number: int, chunks: AsyncIterator[bytes]
+    ) -> str:
+        # Every attempt gets its own file, so a losing concurrent attempt can
+        # never overwrite the bytes of the one that was recorded
+        token = f"{part_number:05d}.{uuid.uuid4().hex}"
+        path = os.path.join(self._parts_dir(key), token)
+        f = await run_in_threadpool(open, path, "wb")
+        try:
+            async for chunk in chunks:
+                await run_in_threadpool(f.write, chunk)
+        except BaseException:
+            await run_in_threadpool(f.close)
+            await self.discard_chunk(key, upload_id, part_number, token)
+            raise
+        await run_in_threadpool(f.close)
+        return token
+
+    async def discard_chunk(self, key: str, upload_id: str | None, part_number: int, token: str) -> None:
+        try:
+            await run_in_threadpool(os.remove, os.path.join(self._parts_dir(key), token))
+        except FileNotFoundError:
+            pass
+
+    async def complete_upload(self, key: str, upload_id: str | None, parts: list[str]) -> None:
+        path = self.local_path(key)
+        parts_dir = self._parts_dir(key)
+
+        def assemble() -> None:
+            if not os.path.isdir(parts_dir) and os.path.exists(path):
+                # Assembled by an earlier attempt that was not recorded
+                return
+            # Concurrent attempts each assemble their own copy; the rename
+            # makes whichever finishes last the stored file
+            partial = f"{path}.{uuid.uuid4().hex}.partial"
+            with open(partial, "wb") as out:
+                for token in parts:
+                    with open(os.path.join(parts_dir, token), "rb") as part:
+                        shutil.copyfileobj(part, out, READ_CHUNK_SIZE * 4)
+            os.replace(partial, path)
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+        await run_in_threadpool(assemble)
+
+    async def delete(self, key: str, upload_id: str | None = None) -> None:
+        await run_in_threadpool(shutil.rmtree, self._parts_dir(key), ignore_errors=True)
+        try:
+            await run_in_threadpool(os.remove, self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    async def size(self, key: str) -> int:
+        return (await run_in_threadpool(os.stat, self.local_path(key))).st_size
+
+    async def checksum(self, key: str) -> str:
+        def digest() -> str:
+            with open(self.local_path(key), "rb") as f:
+                return hashlib.file_digest(f, "sha256").hexdigest()
+
+        return await run_in_threadpool(digest)
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        if end < start:
+            return
+        path = self.local_path(key)
+
+        def open_mapped():
+            with open(path, "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Memory-mapped reads let the page cache serve repeated range
+        # requests (video seeking) without re-reading through a file buffer
+        mapped = await run_in_threadpool(open_mapped)
+        try:
+            position = start
+            while position <= end:
+                stop = min(position + READ_CHUNK_SIZE, end + 1)
+                yield await run_in_threadpool(mapped.__getitem__, slice(position, stop))
+                position = stop
+        finally:
+            mapped.close()
+
+
+class S3StorageBackend(StorageBackend):
+    """S3-compatible storage using multipart uploads, one part per chunk.
+
+    S3 requires every part but the last to be at least 5 MiB, so the media
+    chunk size must respect that.
+    """
+
+    def __init__(self, bucket: str, endpoint_url: str = "", region: str = "") -> None:
+        import boto3
+
+        self.bucket = bucket
+        self._client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None)
+
+    async def begin_upload(self, key: str) -> str:
+        response = await run_in_threadpool(self._client.create_multipart_upload, Bucket=self.bucket, Key=key)
+        return response["UploadId"]
+
+    async def write_chunk(
+        self, key: str, upload_id: str | None, part_number: int, chunks: AsyncIterator[bytes]
+    ) -> str:
+        # boto3 needs a seekable body of known length; spool the part to a
+        # temporary file rather than holding it in memory
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as part:
+            async for chunk in chunks:
+                await run_in_threadpool(part.write, chunk)
+            await run_in_threadpool(part.seek, 0)
+            response = await run_in_threadpool(
+                self._client.upload_part,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=part,
+            )
+        # A later attempt at the same part number replaces this one in S3;
+        # completing with the recorded ETag then fails instead of silently
+        # assembling the other attempt's bytes
+        return response["ETag"]
+
+    async def complete_upload(self, key: str, upload_id: str | None, parts: list[str]) -> None:
+        try:
+            await run_in_threadpool(
+                self._client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [{"PartNumber": number, "ETag": etag} for number, etag in enumerate(parts, start=1)]
+                },
+            )
+        except self._client.exceptions.NoSuchUpload:
+            # Completed by an earlier attempt that was not recorded; head the
+            # object so an upload that was aborted instead still fails
+            await self.size(key)
+
+    async def delete(self, key: str, upload_id: str | None = None) -> None:
+        if upload_id:
+            try:
+                await run_in_threadpool(
+                    self._client.abort_multipart_upload, Bucket=self.bucket, Key=key, UploadId=upload_id
+                )
+            except self._client.exceptions.NoSuchUpload:
+                pass
+        await run_in_threadpool(self._client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def size(self, key: str) -> int:
+        response = await run_in_threadpool(self._client.head_object, Bucket=self.bucket, Key=key)
+        return response["ContentLength"]
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        if end < start:
+            return
+        response = await run_in_threadpool(
+            self._client.get_object, Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}"
+        )
+        body = response["Body"]
+        try:
+            while chunk := await run_in_threadpool(body.read, READ_CHUNK_SIZE):
+                yield chunk
+        finally:
+            body.close()
+
+
+@lru_cache()
+def get_storage() -> StorageBackend:
+    if settings.MEDIA_STORAGE == "s3":
+        return S3StorageBackend(
+            settings.MEDIA_S3_BUCKET,
+            endpoint_url=settings.MEDIA_S3_ENDPOINT_URL,
+            region=settings.MEDIA_S3_REGION,
+        )
+    return LocalStorageBackend(settings.MEDIA_ROOT)
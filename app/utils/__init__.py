@@ -1,6 +1,7 @@
-from .security import  verify_password, create_access_token, create_refresh_token
+from .security import hash_password, verify_password, create_access_token, create_refresh_token
 
 __all__ = [
+    "hash_password",
     "verify_password",
     "create_access_token",
     "create_refresh_token",
@@ -1,16 +1,26 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict
 
 import jwt
-from passlib.context import CryptContext
 
 from ..config import settings
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache()
+def _pwd_context():
+    # passlib and its bcrypt backend load on the first password operation
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(plain_password: str) -> str:
+    return _pwd_context().hash(plain_password)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 
 def _create_token(subject: str, expires_delta: timedelta) -> str:
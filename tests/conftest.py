@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+# Configure the app for an isolated SQLite database and media root before it
+# is imported
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["MEDIA_STORAGE"] = "local"
+os.environ["MEDIA_ROOT"] = tempfile.mkdtemp()
+os.environ["MEDIA_CHUNK_SIZE"] = "1000"
+os.environ["DEBUG"] = "false"
+os.environ["ENV_FILE"] = ""
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.database import Base, SessionLocal, engine
+from app.main import app
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def client(db):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed on the app engine while the test runs."""
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
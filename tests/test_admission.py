@@ -0,0 +1,156 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app, create_app
+from app.middleware import AdmissionControlMiddleware, AdmissionMetrics
+
+
+pytestmark = pytest.mark.anyio
+
+
+class _BlockingApp:
+    """Holds every request open until ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.entered = 0
+
+    async def __call__(self, scope, receive, send):
+        self.entered += 1
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _scope(path: str = "/courses/", tenant_id: str = "1", method: str = "GET") -> dict:
+    return {
+        "type": "http",
+        "app": app,
+        "method": method,
+        "path": path,
+        "headers": [(b"x-tenant-id", tenant_id.encode())],
+    }
+
+
+async def _call(app, scope: dict) -> list[dict]:
+    sent: list[dict] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+async def _until(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+async def test_sheds_when_tenant_quota_is_exhausted():
+    inner = _BlockingApp()
+    metrics = AdmissionMetrics()
+    admission = AdmissionControlMiddleware(
+        inner, max_concurrency=10, tenant_max_concurrency=1, queue_timeout=0.05, metrics=metrics
+    )
+    holder = asyncio.create_task(_call(admission, _scope(tenant_id="1")))
+    await _until(lambda: inner.entered == 1)
+
+    rejected = await _call(admission, _scope(tenant_id="1"))
+    assert rejected[0]["status"] == 503
+    assert (b"retry-after", b"1") in rejected[0]["headers"]
+
+    # Another tenant still gets through
+    inner.release.set()
+    other = await _call(admission, _scope(tenant_id="2"))
+    assert other[0]["status"] == 200
+    await holder
+
+    assert metrics.shed == {"tenant_timeout": 1}
+    assert metrics.shed_by_tenant == {"1": 1}
+    assert metrics.in_flight == metrics.queued == 0
+    assert admission._tenants == {}
+
+
+async def test_sheds_when_queue_is_full():
+    inner = _BlockingApp()
+    metrics = AdmissionMetrics()
+    admission = AdmissionControlMiddleware(inner, max_concurrency=1, max_queue=0, metrics=metrics)
+
+    rejected = await _call(admission, _scope())
+    assert rejected[0]["status"] == 503
+    assert metrics.shed == {"queue_full": 1}
+    assert inner.entered == 0
+
+
+async def test_marked_routes_and_preflight_requests_bypass_admission():
+    inner = _BlockingApp()
+    inner.release.set()
+    metrics = AdmissionMetrics()
+    admission = AdmissionControlMiddleware(inner, max_queue=0, metrics=metrics)
+
+    for method, path in [
+        ("GET", "/health"),
+        ("POST", "/payments/webhook"),
+        ("GET", "/payments/7/events"),
+        ("GET", "/courses/1/media/2/content"),
+        ("HEAD", "/courses/1/media/2/content"),
+        ("OPTIONS", "/courses/"),
+    ]:
+        assert (await _call(admission, _scope(path, method=method)))[0]["status"] == 200, (method, path)
+    assert metrics.bypassed == 6
+    assert not metrics.shed
+
+    # Uploads share the download path but are ordinary admitted requests
+    assert (await _call(admission, _scope("/courses/1/media/2/content", method="PUT")))[0]["status"] == 503
+    assert (await _call(admission, _scope("/courses/")))[0]["status"] == 503
+    assert metrics.shed == {"queue_full": 2}
+
+
+async def test_cancelled_waiter_releases_tenant_permit():
+    inner = _BlockingApp()
+    admission = AdmissionControlMiddleware(
+        inner, max_concurrency=1, tenant_max_concurrency=1, queue_timeout=5, metrics=AdmissionMetrics()
+    )
+    # Tenant 1 holds the only global slot
+    holder = asyncio.create_task(_call(admission, _scope(tenant_id="1")))
+    await _until(lambda: inner.entered == 1)
+
+    # Tenant 2 takes its tenant permit, then waits for the global slot; a
+    # second tenant 2 request queues behind it for the tenant permit
+    cancelled = asyncio.create_task(_call(admission, _scope(tenant_id="2")))
+    await _until(lambda: admission.metrics.queued == 1)
+    waiting = asyncio.create_task(_call(admission, _scope(tenant_id="2")))
+    await _until(lambda: admission.metrics.queued == 2)
+
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    # The permit handed back on cancellation lets the queued request proceed
+    inner.release.set()
+    assert (await asyncio.wait_for(waiting, 1))[0]["status"] == 200
+    await holder
+    assert admission.metrics.in_flight == admission.metrics.queued == 0
+    assert admission._tenants == {}
+
+
+async def test_rejections_carry_cors_headers():
+    app = create_app()
+    for middleware in app.user_middleware:
+        if middleware.cls is AdmissionControlMiddleware:
+            middleware.kwargs["max_queue"] = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/courses/", headers={"Origin": "http://localhost:3000"})
+
+    assert response.status_code == 503
+    assert response.headers["access-control-allow-origin"] == "*"
@@ -0,0 +1,101 @@
+import gzip
+import zlib
+
+import pytest
+
+from app.middleware import CompressionMiddleware
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _app(chunks: list[bytes], headers: dict[str, str] | None = None):
+    async def app(scope, receive, send):
+        response_headers = {"content-type": "application/json", **(headers or {})}
+        raw_headers = [(name.encode(), value.encode()) for name, value in response_headers.items()]
+        await send({"type": "http.response.start", "status": 200, "headers": raw_headers})
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+
+    return app
+
+
+async def _call(app, path: str = "/courses/", accept_encoding: str = "gzip") -> tuple[dict, list[dict]]:
+    sent: list[dict] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    await CompressionMiddleware(app, minimum_size=500)(scope, receive, send)
+    start, *bodies = sent
+    return {name.decode(): value.decode() for name, value in start["headers"]}, bodies
+
+
+def _body(messages: list[dict]) -> bytes:
+    return b"".join(message.get("body", b"") for message in messages)
+
+
+async def test_small_responses_are_not_compressed_even_when_chunked():
+    headers, bodies = await _call(_app([b"a" * 200, b"b" * 200]))
+    assert "content-encoding" not in headers
+    assert _body(bodies) == b"a" * 200 + b"b" * 200
+
+
+async def test_response_reaching_threshold_across_chunks_is_compressed():
+    payload = [b"x" * 300, b"y" * 300]
+    headers, bodies = await _call(_app(payload, {"content-length": "600"}))
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    # The whole body was buffered under the threshold, so its length is exact
+    assert int(headers["content-length"]) == len(_body(bodies))
+    assert gzip.decompress(_body(bodies)) == b"".join(payload)
+
+
+async def test_single_body_is_compressed_with_exact_length():
+    headers, bodies = await _call(_app([b"z" * 2000], {"content-length": "2000"}))
+    assert headers["content-encoding"] == "gzip"
+    assert int(headers["content-length"]) == len(_body(bodies))
+    assert gzip.decompress(_body(bodies)) == b"z" * 2000
+
+
+async def test_streamed_chunks_are_flushed_as_they_arrive():
+    payload = [bytes([65 + i]) * 600 for i in range(5)]
+    headers, bodies = await _call(_app(payload))
+    assert headers["content-encoding"] == "gzip"
+    # One compressed message per source chunk instead of one buffered body
+    assert len(bodies) == len(payload)
+    assert all(message["body"] for message in bodies[:-1])
+    decompressor = zlib.decompressobj(31)
+    assert decompressor.decompress(bodies[0]["body"]) == payload[0]
+    assert gzip.decompress(_body(bodies)) == b"".join(payload)
+
+
+async def test_client_without_gzip_gets_identity():
+    headers, bodies = await _call(_app([b"x" * 2000]), accept_encoding="identity, gzip;q=0")
+    assert "content-encoding" not in headers
+    assert _body(bodies) == b"x" * 2000
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"cache-control": "private, no-transform"},
+        {"content-range": "bytes 0-1999/4000"},
+        {"content-encoding": "br"},
+        {"content-type": "text/event-stream"},
+    ],
+)
+async def test_routes_can_opt_out_through_response_headers(headers):
+    response_headers, bodies = await _call(_app([b"x" * 1000, b"y" * 1000], headers))
+    assert response_headers.get("content-encoding") == headers.get("content-encoding")
+    assert _body(bodies) == b"x" * 1000 + b"y" * 1000
+
+
+async def test_webhook_path_is_left_untouched():
+    headers, bodies = await _call(_app([b"x" * 2000]), path="/payments/webhook")
+    assert "content-encoding" not in headers
+    assert _body(bodies) == b"x" * 2000
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.models import Course, Organization, User
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def _seed(db, courses: int) -> None:
+    db.add(Organization(id=1, name="Acme", slug="acme"))
+    db.add(User(id=1, email="teacher@acme.io", full_name="Ada Teacher", role="instructor", hashed_password="x", tenant_id=1))
+    await db.flush()
+    await _add_courses(db, courses)
+
+
+async def _add_courses(db, count: int) -> None:
+    db.add_all(
+        Course(title=f"Course {i}", description="", tenant_id=1, instructor_id=1, price_cents=0) for i in range(count)
+    )
+    await db.commit()
+
+
+async def _list_courses(client, statements) -> tuple[list[dict], int]:
+    statements.clear()
+    response = await client.get("/courses/", headers={"X-Tenant-ID": "1"})
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+async def test_list_courses_runs_fixed_number_of_statements(db, client, statements):
+    await _seed(db, courses=1)
+    courses, one_course_statements = await _list_courses(client, statements)
+    assert len(courses) == 1
+
+    await _add_courses(db, 49)
+    courses, fifty_course_statements = await _list_courses(client, statements)
+    assert len(courses) == 50
+
+    assert one_course_statements == fifty_course_statements == 1
+    for course in courses:
+        assert course["instructor"] == {"id": 1, "full_name": "Ada Teacher"}
+        assert course["organization"] == {"id": 1, "name": "Acme", "slug": "acme"}
+
+
+async def test_relationships_raise_on_lazy_load(db):
+    await _seed(db, courses=1)
+    db.expunge_all()
+    course = await db.scalar(select(Course))
+    # MissingGreenlet is also an InvalidRequestError, so match the raiseload
+    # message to be sure the relationship refused to lazy-load
+    with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+        course.instructor
+    with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+        course.organization
@@ -0,0 +1,249 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import Course, CourseMedia, Organization, User
+from app.routers.media import _parse_content_range
+from app.services.delivery import RangeNotSatisfiable, parse_byte_range
+from app.services.storage import get_storage
+from app.utils import create_access_token
+
+
+pytestmark = pytest.mark.anyio
+
+HEADERS = {"X-Tenant-ID": "1", "Authorization": f"Bearer {create_access_token('1')}"}
+CONTENT = bytes(range(256)) * 10  # 2560 bytes: chunks of 1000, 1000 and 560
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5-4", "bytes=-0", "bytes=abc", "bytes=5"])
+def test_parse_byte_range_rejects_unsatisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(header, 1000)
+
+
+def test_parse_content_range():
+    assert _parse_content_range("bytes 0-999/2560") == (0, 999, 2560)
+
+
+@pytest.mark.parametrize("header", [None, "", "bytes 0-999", "bytes 5-4/10", "items 0-9/10", "bytes */10"])
+def test_parse_content_range_rejects_malformed(header):
+    with pytest.raises(HTTPException) as exc:
+        _parse_content_range(header)
+    assert exc.value.status_code == 400
+
+
+async def _seed(db) -> None:
+    db.add(Organization(id=1, name="Acme", slug="acme"))
+    db.add(User(id=1, email="teacher@acme.io", full_name="Ada Teacher", role="instructor", hashed_password="x", tenant_id=1))
+    await db.flush()
+    db.add(Course(id=1, title="Course", description="", tenant_id=1, instructor_id=1, price_cents=0))
+    await db.commit()
+
+
+async def _create(client, content_type: str = "video/mp4", sha256: str | None = None) -> dict:
+    response = await client.post(
+        "/courses/1/media/",
+        headers=HEADERS,
+        json={
+            "filename": "intro.mp4",
+            "content_type": content_type,
+            "size_bytes": len(CONTENT),
+            "sha256": sha256 or hashlib.sha256(CONTENT).hexdigest(),
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def _put(client, media_id: int, start: int, end: int, body: bytes | None = None):
+    return await client.put(
+        f"/courses/1/media/{media_id}/content",
+        headers={**HEADERS, "Content-Range": f"bytes {start}-{end}/{len(CONTENT)}"},
+        content=CONTENT[start:end + 1] if body is None else body,
+    )
+
+
+async def _media(client, media_id: int) -> dict:
+    return (await client.get(f"/courses/1/media/{media_id}", headers=HEADERS)).json()
+
+
+async def test_chunked_upload_and_ranged_download(db, client):
+    await _seed(db)
+    media = await _create(client)
+    assert media["chunk_size"] == 1000
+
+    for start in range(0, len(CONTENT), 1000):
+        response = await _put(client, media["id"], start, min(start + 999, len(CONTENT) - 1))
+        assert response.status_code == 200, response.text
+    assert response.json()["status"] == "ready"
+
+    response = await client.get(
+        f"/courses/1/media/{media['id']}/content", headers={**HEADERS, "Range": "bytes=1000-1099"}
+    )
+    assert response.status_code == 206
+    assert response.content == CONTENT[1000:1100]
+    assert response.headers["content-range"] == f"bytes 1000-1099/{len(CONTENT)}"
+    assert response.headers["content-type"] == "video/mp4"
+    assert response.headers["content-disposition"].startswith("inline;")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "content-encoding" not in response.headers
+
+
+async def test_chunk_replays_and_bad_lengths_leave_the_offset_alone(db, client):
+    await _seed(db)
+    media = await _create(client)
+    assert (await _put(client, media["id"], 0, 999)).status_code == 200
+
+    replay = await _put(client, media["id"], 0, 999)
+    assert replay.status_code == 409
+    assert replay.headers["upload-offset"] == "1000"
+
+    short = await _put(client, media["id"], 1000, 1999, body=CONTENT[1000:1500])
+    assert short.status_code == 400
+    assert short.json()["detail"] == "Chunk shorter than declared"
+
+    long = await _put(client, media["id"], 1000, 1999, body=CONTENT[1000:2001])
+    assert long.status_code == 400
+    assert long.json()["detail"] == "Chunk larger than declared"
+
+    layout = await _put(client, media["id"], 1000, 1499)
+    assert layout.status_code == 400
+
+    corrupt = await client.put(
+        f"/courses/1/media/{media['id']}/content",
+        headers={**HEADERS, "Content-Range": f"bytes 1000-1999/{len(CONTENT)}", "X-Chunk-SHA256": "0" * 64},
+        content=CONTENT[1000:2000],
+    )
+    assert corrupt.status_code == 400
+
+    assert (await _media(client, media["id"]))["uploaded_bytes"] == 1000
+    # Only the recorded attempt's part is left in storage
+    row = await db.get(CourseMedia, media["id"])
+    assert len(os.listdir(get_storage().local_path(row.storage_key) + ".parts")) == 1
+
+
+async def test_concurrent_attempts_at_a_chunk_record_only_one(db, client):
+    await _seed(db)
+    media = await _create(client)
+    other_done = asyncio.Event()
+
+    async def slow_body():
+        yield CONTENT[:500]
+        await other_done.wait()
+        yield CONTENT[500:1000]
+
+    slow = asyncio.create_task(
+        client.put(
+            f"/courses/1/media/{media['id']}/content",
+            headers={**HEADERS, "Content-Range": f"bytes 0-999/{len(CONTENT)}"},
+            content=slow_body(),
+        )
+    )
+    await asyncio.sleep(0.05)
+    # Both attempts passed the offset check; the compare-and-set picks one
+    assert (await _put(client, media["id"], 0, 999)).status_code == 200
+    other_done.set()
+    response = await slow
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Chunk already uploaded"
+    assert (await _media(client, media["id"]))["uploaded_bytes"] == 1000
+
+
+async def test_failed_completion_can_be_retried(db, client, monkeypatch):
+    await _seed(db)
+    media = await _create(client)
+    await _put(client, media["id"], 0, 999)
+    await _put(client, media["id"], 1000, 1999)
+
+    storage = get_storage()
+    size = storage.size
+    failures = iter([OSError("disk went away")])
+
+    async def flaky_size(key):
+        for error in failures:
+            raise error
+        return await size(key)
+
+    # Fails after the parts were assembled, as a crash would
+    monkeypatch.setattr(storage, "size", flaky_size)
+    response = await _put(client, media["id"], 2000, len(CONTENT) - 1)
+    assert response.status_code == 503
+    assert (await _media(client, media["id"]))["status"] == "uploading"
+
+    resend = await _put(client, media["id"], 2000, len(CONTENT) - 1)
+    assert resend.status_code == 409
+    assert resend.headers["upload-offset"] == str(len(CONTENT))
+
+    for _ in range(2):
+        completed = await client.post(f"/courses/1/media/{media['id']}/complete", headers=HEADERS)
+        assert completed.status_code == 200, completed.text
+        assert completed.json()["status"] == "ready"
+
+    download = await client.get(f"/courses/1/media/{media['id']}/content", headers=HEADERS)
+    assert download.content == CONTENT
+
+
+async def test_completion_requires_every_chunk(db, client):
+    await _seed(db)
+    media = await _create(client)
+    await _put(client, media["id"], 0, 999)
+    response = await client.post(f"/courses/1/media/{media['id']}/complete", headers=HEADERS)
+    assert response.status_code == 409
+    assert response.headers["upload-offset"] == "1000"
+
+
+async def test_checksum_mismatch_fails_the_upload(db, client):
+    await _seed(db)
+    media = await _create(client, sha256="0" * 64)
+    for start in range(0, len(CONTENT), 1000):
+        response = await _put(client, media["id"], start, min(start + 999, len(CONTENT) - 1))
+    assert response.status_code == 422
+    assert (await _media(client, media["id"]))["status"] == "failed"
+
+
+@pytest.mark.parametrize("content_type", ["text/html", "image/svg+xml", "application/javascript", "vidéo/mp4"])
+async def test_scriptable_content_types_are_rejected(db, client, content_type):
+    await _seed(db)
+    response = await client.post(
+        "/courses/1/media/",
+        headers=HEADERS,
+        json={"filename": "x", "content_type": content_type, "size_bytes": 10},
+    )
+    assert response.status_code == 422
+
+
+async def test_legacy_unsafe_media_is_served_as_attachment(db, client):
+    await _seed(db)
+    media = await _create(client)
+    for start in range(0, len(CONTENT), 1000):
+        await _put(client, media["id"], start, min(start + 999, len(CONTENT) - 1))
+    row = await db.get(CourseMedia, media["id"])
+    row.content_type = "text/html"
+    await db.commit()
+
+    response = await client.get(f"/courses/1/media/{media['id']}/content", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["content-disposition"].startswith("attachment;")
+    assert response.headers["x-content-type-options"] == "nosniff"
+